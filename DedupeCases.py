@@ -0,0 +1,72 @@
+import sys
+from db import CASE_KEY, ensure_indexes, get_collection
+
+# ---------------------------
+# Configuration & Constants
+# ---------------------------
+
+USAGE_TEXT = (
+    "Usage: {script} <mongodb_conn> [--dry-run]\n"
+    "  <mongodb_conn>: MongoDB URI, e.g. mongodb://localhost:27017\n"
+    "  --dry-run: only report the duplicates, do not delete them"
+)
+
+# Groups documents sharing a case key, best copy first: one with a docket,
+# then the most recently scraped. Docket HTML is dropped once measured.
+DUPLICATES_PIPELINE = [
+    {"$addFields": {
+        "HasDocket": {"$gt": [{"$strLenCP": {"$ifNull": ["$Docket", ""]}}, 0]}
+    }},
+    {"$project": {"Docket": 0}},
+    {"$sort": {"HasDocket": -1, "TimeScraped": -1}},
+    {"$group": {
+        "_id": {field: f"${field}" for field in CASE_KEY},
+        "ids": {"$push": "$_id"},
+        "count": {"$sum": 1},
+    }},
+    {"$match": {"count": {"$gt": 1}}},
+]
+
+def usage():
+    """
+    Print usage instructions and exit.
+    """
+    script = sys.argv[0]
+    print(USAGE_TEXT.format(script=script))
+    sys.exit(1)
+
+
+# ---------------------------
+# Command-line argument parsing
+# ---------------------------
+if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] != "--dry-run"):
+    usage()
+
+MONGO_URI = sys.argv[1]
+DRY_RUN = len(sys.argv) == 3
+
+
+def dedupe_cases(mongo_uri: str, dry_run: bool = False) -> int:
+    """
+    Delete every duplicate of a (CaseYear, County, CaseNumber) case except the
+    best copy, so the unique case index can be built. Returns the number of
+    documents deleted (or that would be deleted on a dry run).
+    """
+    collection = get_collection(mongo_uri)
+
+    extra_ids = []
+    for group in collection.aggregate(DUPLICATES_PIPELINE, allowDiskUse=True):
+        print(f"{group['count']} copies of case:", group["_id"])
+        extra_ids.extend(group["ids"][1:])
+
+    print(f"Duplicate documents to delete: {len(extra_ids)}")
+    if extra_ids and not dry_run:
+        collection.delete_many({"_id": {"$in": extra_ids}})
+    return len(extra_ids)
+
+
+if __name__ == "__main__":
+    dedupe_cases(MONGO_URI, DRY_RUN)
+    if not DRY_RUN:
+        # The unique index can be built now that the duplicates are gone
+        ensure_indexes(MONGO_URI)
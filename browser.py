@@ -0,0 +1,50 @@
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+
+# Subresources the scraper never reads; requests for them are aborted.
+# Stylesheets stay allowed: the result wait checks visibility, and without
+# CSS an alert the site hides (d-none, collapse) would count as visible.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# ---------------------------
+# Browser Lifecycle
+# ---------------------------
+
+@asynccontextmanager
+async def browser_session():
+    """
+    Launch one headless Chromium for the duration of the block.
+    Callers that scrape several batches reuse it, paying the cold start once.
+    """
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+async def block_assets(route) -> None:
+    """
+    Playwright route handler that aborts requests for unused subresources.
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def new_scrape_context(browser, timeout_ms: int):
+    """
+    Create an isolated browser context for one scraping batch.
+    Every page opened in it inherits the timeouts and the asset blocking.
+    """
+    context = await browser.new_context()
+
+    # Set default timeouts (inherited by every page in the context)
+    context.set_default_timeout(timeout_ms)
+    context.set_default_navigation_timeout(timeout_ms)
+
+    # Only the HTML is read, so skip downloading images, fonts and media
+    await context.route("**/*", block_assets)
+    return context
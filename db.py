@@ -0,0 +1,81 @@
+from functools import lru_cache
+from pymongo import ASCENDING, AsyncMongoClient, MongoClient
+from pymongo.errors import OperationFailure
+
+# Database and collection holding the scraped cases
+DB_NAME = "Cluster0"
+COLLECTION_NAME = "Cases"
+
+# Fields that identify a case; unique across the collection
+CASE_KEY = ("CaseYear", "County", "CaseNumber")
+
+# Connection pool settings shared by the sync and async clients
+POOL_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 5,
+    "maxIdleTimeMS": 60_000,
+    "retryWrites": True,
+}
+
+# ---------------------------
+# Client Factories
+# ---------------------------
+
+@lru_cache(maxsize=None)
+def get_client(mongo_uri: str) -> MongoClient:
+    """
+    Return the process-wide MongoClient for the given URI.
+    The connection pool is created on first use and reused afterwards.
+    """
+    return MongoClient(mongo_uri, **POOL_OPTIONS)
+
+
+def get_collection(mongo_uri: str):
+    """
+    Return the cases collection on the shared sync client.
+    """
+    return get_client(mongo_uri)[DB_NAME][COLLECTION_NAME]
+
+
+@lru_cache(maxsize=None)
+def get_async_client(mongo_uri: str) -> AsyncMongoClient:
+    """
+    Return the process-wide PyMongo async client for the given URI.
+    Must first be called from inside the event loop that will use it.
+    """
+    return AsyncMongoClient(mongo_uri, **POOL_OPTIONS)
+
+
+def get_async_collection(mongo_uri: str):
+    """
+    Return the cases collection on the shared async client.
+    """
+    return get_async_client(mongo_uri)[DB_NAME][COLLECTION_NAME]
+
+
+# ---------------------------
+# Helper Functions
+# ---------------------------
+
+def ensure_indexes(mongo_uri: str) -> None:
+    """
+    Create the unique case index if it does not exist yet.
+    Its (CaseYear, County) prefix also serves the checkpoint aggregation.
+
+    If existing duplicate cases block the index, log it and carry on
+    without it; DedupeCases.py removes the duplicates.
+    """
+    try:
+        get_collection(mongo_uri).create_index(
+            [(field, ASCENDING) for field in CASE_KEY], unique=True
+        )
+    except OperationFailure as e:
+        print("WARNING could not create the unique case index "
+              "(run DedupeCases.py to remove duplicate cases):", e)
+
+
+def case_key(case: dict) -> dict:
+    """
+    Return the filter matching the stored document for a case.
+    """
+    return {field: case[field] for field in CASE_KEY}
@@ -0,0 +1,73 @@
+import re
+
+try:
+    import hyperscan
+except ImportError:  # no wheel for this platform; DOB_RE is used instead
+    hyperscan = None
+
+# ---------------------------
+# Year of Birth Extraction
+# ---------------------------
+
+# "Date of Birth" label followed by a four-digit year. The old BeautifulSoup
+# lookup searched the label's parent text, descendants included, so up to three
+# inline tags (span, b, label, ...) may sit between label and year; any other
+# tag (td, div, p, ...) ends the search. Unlike the old lookup, a year right
+# after the inline element wrapping the label (<a>DOB</a> 2005) also matches.
+# No lookarounds: the pattern must also compile under Hyperscan.
+DOB_INLINE_TAG = r"</?(?:span|b|strong|em|i|u|font|label|a|br)\b[^<>]{0,80}>"
+DOB_PATTERN = (
+    r"(?:Date of Birth|DOB|Birth Date)"
+    r"(?:[^<]{0,100}?" + DOB_INLINE_TAG + r"){0,3}?"
+    r"[^<]{0,100}?\b((?:19|20)\d{2})\b"
+)
+DOB_RE = re.compile(DOB_PATTERN, re.IGNORECASE)
+
+# Hyperscan build of the same pattern; only match end offsets are reported,
+# and the year is always the last four characters of a match
+if hyperscan is not None:
+    DOB_DB = hyperscan.Database()
+    DOB_DB.compile(
+        expressions=[DOB_PATTERN.encode()],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_CASELESS],
+    )
+else:
+    DOB_DB = None
+
+
+def year_of_birth_re(html: str) -> str:
+    """
+    Year of Birth via DOB_RE. Returns None if not found.
+    """
+    match = DOB_RE.search(html)
+    return match.group(1) if match else None
+
+
+def year_of_birth_hyperscan(html: str) -> str:
+    """
+    Year of Birth via DOB_DB; same result as year_of_birth_re.
+    Returns None if not found.
+    """
+    data = html.encode()
+    found = []
+
+    def on_match(match_id, start, end, flags, context):
+        found.append(data[end - 4:end].decode())
+        return True  # stop at the earliest match
+
+    try:
+        DOB_DB.scan(data, match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass
+    return found[0] if found else None
+
+
+def extract_year_of_birth(html: str) -> str:
+    """
+    Extract the Year of Birth from the case summary HTML, using Hyperscan
+    where it is installed. Returns None if not found.
+    """
+    if DOB_DB is None:
+        return year_of_birth_re(html)
+    return year_of_birth_hyperscan(html)
@@ -0,0 +1,20 @@
+from dob import DOB_DB, year_of_birth_hyperscan, year_of_birth_re
+
+# Sample case summary markup and the Year of Birth each should yield
+SAMPLES = {
+    "plain": ("<td>Date of Birth: 01/02/2005</td>", "2005"),
+    "span-wrapped": ("<td>DOB: <span class='v'>03/04/2006</span></td>", "2006"),
+    "bold label": ("<p><b>Birth Date</b> 2004-05-06</p>", "2004"),
+    "td-split": ("<tr><td>Date of Birth</td><td>01/02/2005</td></tr>", None),
+    "no DOB": ("<td>Filed: 01/02/2021</td><td>Case 2021JV000123</td>", None),
+    "first of two": ("<td>DOB 1999</td><td>Date of Birth 2001</td>", "1999"),
+}
+
+for name, (html, expected) in SAMPLES.items():
+    found = year_of_birth_re(html)
+    assert found == expected, f"{name}: re found {found!r}, expected {expected!r}"
+    if DOB_DB is not None:
+        found = year_of_birth_hyperscan(html)
+        assert found == expected, f"{name}: hyperscan found {found!r}, expected {expected!r}"
+
+print(f"{len(SAMPLES)} DOB samples agree", "(re only, hyperscan not installed)" if DOB_DB is None else "(re and hyperscan)")
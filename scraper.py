@@ -0,0 +1,375 @@
+import asyncio
+import contextlib
+import re
+from playwright.async_api import Error as PlaywrightError
+from browser import browser_session, new_scrape_context
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from db import case_key, get_async_collection
+
+try:
+    import uvloop
+except ImportError:  # no uvloop build for this platform (Windows)
+    uvloop = None
+
+# ---------------------------
+# Configuration & Constants
+# ---------------------------
+
+# Global timeout for Playwright actions (milliseconds)
+TIMEOUT_MS = 60_000  # 60 seconds
+
+# Number of pages scraping concurrently within the shared browser context
+MAX_CONCURRENCY = 8
+
+# Number of scraped records buffered before a single bulk_write
+INSERT_BATCH_SIZE = 100
+
+# Seconds a partial batch may wait before the writer flushes it
+FLUSH_INTERVAL_S = 1.0
+
+# Maximum scraped records waiting for the writer before scrapers block
+WRITE_QUEUE_SIZE = 500
+
+# Alert shown by the search page when no case matches
+NO_RESULTS_SELECTOR = "#info.alert.alert-info"
+
+# Opening tags with id="info" and their class attribute, for spotting the
+# NO_RESULTS_SELECTOR alert in raw response HTML
+INFO_TAG_RE = re.compile(r"""<[^>]*\bid\s*=\s*["']info["'][^>]*>""", re.IGNORECASE)
+CLASS_ATTR_RE = re.compile(r"""\bclass\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+
+# The search form's case number input; a response still showing it may be
+# the form re-rendered after a rejected or invalid submission
+SEARCH_FORM_MARKER = 'id="case_id"'
+
+# Batch fields used only to fill in the search, never stored with the record
+SCRAPE_ONLY_FIELDS = {"YearSuffix"}
+
+# Search form selections shared by every case (district court, juvenile)
+FORM_CONSTANTS = {"court_type": "D", "case_type": "JV"}
+
+# Checks the FORM_CONSTANTS selections and re-selects any that reset, firing
+# the same input/change events as select_option, in a single round trip.
+# Returns the ids whose value is not an option, for select_option to report.
+SELECT_CONSTANTS_JS = """
+(button, constants) => {
+  const failed = [];
+  for (const [id, value] of Object.entries(constants)) {
+    const el = document.getElementById(id);
+    if (!el) { failed.push(id); continue; }
+    if (el.value === value) continue;
+    el.value = value;
+    if (el.value !== value) { failed.push(id); continue; }
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+  }
+  return failed;
+}
+"""
+
+# Ids of the search form inputs, and of the form elements including the button
+FORM_INPUTS = ("court_type", "county_num", "case_type", "case_year", "case_id")
+FORM_FIELDS = (*FORM_INPUTS, "search")
+
+# Reads the search form's action, default fields (including any hidden
+# tokens), input names and county option values. Returns null unless the
+# form is a plain POST whose inputs all have names.
+POST_FORM_JS = """
+(button, ids) => {
+  const form = button.form;
+  if (!form || form.method.toLowerCase() !== "post") return null;
+  const names = {};
+  for (const id of ids) {
+    const el = document.getElementById(id);
+    if (!el || !el.name) return null;
+    names[id] = el.name;
+  }
+  const counties = {};
+  for (const option of document.getElementById("county_num").options) {
+    counties[option.value] = option.value;
+    counties[option.label] = option.value;
+  }
+  return {
+    action: form.action,
+    fields: Object.fromEntries(new FormData(form, button)),
+    names: names,
+    counties: counties,
+  };
+}
+"""
+
+# ---------------------------
+# Scraping
+# ---------------------------
+
+def form_locators(page) -> dict:
+    """
+    Build the search form locators for a page once, so each case reuses them.
+    "result" resolves to the first visible case summary or no-results alert;
+    a hidden placeholder alert earlier in the page is skipped.
+    """
+    form = {name: page.locator(f"#{name}") for name in FORM_FIELDS}
+    form["result"] = page.get_by_text("Case Summary").or_(
+        page.locator(NO_RESULTS_SELECTOR)
+    ).filter(visible=True).first
+    return form
+
+
+def is_no_results_page(html: str) -> bool:
+    """
+    Whether raw HTML is the no-results page: it carries the same alert
+    NO_RESULTS_SELECTOR matches and no longer shows the search form.
+    """
+    if SEARCH_FORM_MARKER in html:
+        return False
+    for tag in INFO_TAG_RE.findall(html):
+        match = CLASS_ATTR_RE.search(tag)
+        if match and {"alert", "alert-info"} <= set(match.group(1).split()):
+            return True
+    return False
+
+
+async def read_post_form(form: dict) -> dict:
+    """
+    Describe the loaded search form for direct HTTP submission.
+    Returns None when the form cannot be submitted as a plain POST.
+    """
+    return await form["search"].evaluate(POST_FORM_JS, list(FORM_INPUTS))
+
+
+def default_record(case: dict, html: str) -> dict:
+    """
+    Build the stored record for a found case: the case plus its docket HTML.
+    """
+    return case | {"Docket": html}
+
+
+async def scrape_cases(
+    cases: list[dict],
+    url: str,
+    mongo_uri: str,
+    update_op: str,
+    build_record=None,
+    browser=None,
+) -> None:
+    """
+    Use Playwright to scrape each case's docket page and store results in MongoDB.
+
+    Each record is written with UpdateOne(case_key(record), {update_op: record},
+    upsert=True). build_record(case, html) turns a found case into the record
+    to store; by default the docket HTML is added to the case. Fields in
+    SCRAPE_ONLY_FIELDS are dropped from the case before it is stored.
+
+    Cases are scraped concurrently on a pool of MAX_CONCURRENCY pages that
+    share a single browser context. Pass an open browser (see
+    browser.browser_session) to reuse it across batches. For each case dict:
+      - POST the search form directly through the context's HTTP client
+        (read once from the loaded form: action, hidden fields, input names)
+      - If that is not possible or the response is not a result page, fall
+        back to the browser:
+          - Open the search form (loaded once per page, then reached via go_back)
+          - Fill form fields: court type, county, case type, year, ID
+          - Submit and wait for the case summary or the no-results alert
+      - If "Case Summary" found in HTML, build the record and upsert it into MongoDB
+        (queued for a writer task that upserts in batches of INSERT_BATCH_SIZE)
+      - Otherwise, log "Not Available"
+      - Handle timeouts and other Playwright errors by logging "ERROR"
+    """
+    # Async collection so inserts do not block the event loop
+    collection = get_async_collection(mongo_uri)
+    if build_record is None:
+        build_record = default_record
+
+    async with contextlib.AsyncExitStack() as stack:
+        # Reuse the caller's browser, or launch one just for this batch
+        if browser is None:
+            browser = await stack.enter_async_context(browser_session())
+        # One context per batch, shared by every page
+        context = await new_scrape_context(browser, TIMEOUT_MS)
+        # Closed even if scraping fails, so a caller's browser never leaks it
+        stack.push_async_callback(context.close)
+
+        # Pool of pages borrowed by the concurrent workers
+        pages = asyncio.Queue()
+        for _ in range(min(MAX_CONCURRENCY, len(cases))):
+            page = await context.new_page()
+            pages.put_nowait((page, form_locators(page)))
+
+        # Scraped records flow through a queue to a single batching writer
+        records = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        done = object()
+
+        async def write_batch(batch: list[dict]) -> None:
+            ops = [
+                UpdateOne(case_key(record), {update_op: record}, upsert=True)
+                for record in batch
+            ]
+            try:
+                await collection.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                print("ERROR writing records:", e.details["writeErrors"])
+            except PyMongoError as e:
+                # Connection-level failures lose this batch but keep the writer alive
+                print(f"ERROR writing {len(batch)} records:", e)
+
+        async def enqueue(item) -> None:
+            # Hand an item to the writer. If the writer has died, raise its
+            # exception instead of blocking forever on a full queue.
+            if not writer_task.done():
+                put = asyncio.ensure_future(records.put(item))
+                await asyncio.wait({put, writer_task}, return_when=asyncio.FIRST_COMPLETED)
+                if put.done():
+                    return
+                put.cancel()
+            writer_task.result()
+            raise RuntimeError("MongoDB writer stopped before all records were queued")
+
+        async def writer() -> None:
+            # Flush when the batch is full or its oldest record hits the interval
+            loop = asyncio.get_running_loop()
+            batch = []
+            deadline = None
+            while True:
+                timeout = None if deadline is None else deadline - loop.time()
+                try:
+                    record = await asyncio.wait_for(records.get(), timeout)
+                except asyncio.TimeoutError:
+                    record = None
+                if record is done:
+                    break
+                if record is not None:
+                    if not batch:
+                        deadline = loop.time() + FLUSH_INTERVAL_S
+                    batch.append(record)
+                if len(batch) >= INSERT_BATCH_SIZE or (batch and loop.time() >= deadline):
+                    await write_batch(batch)
+                    batch = []
+                    deadline = None
+            if batch:
+                await write_batch(batch)
+
+        async def open_form(page, form: dict) -> None:
+            # Only load the search page when the form is not already showing
+            # (a fresh page, or a failed step back from the results)
+            if not await form["case_id"].count():
+                await page.goto(url)
+            # Same for every case. A form restored by go_back usually keeps
+            # them, but a re-fetched or autocomplete="off" form resets them;
+            # check and fix both in one evaluate instead of a call per field.
+            failed = await form["search"].evaluate(SELECT_CONSTANTS_JS, FORM_CONSTANTS)
+            for field in failed:
+                await form[field].select_option(FORM_CONSTANTS[field])
+
+        # Read the search form once so cases can be posted without the renderer
+        post_form = None
+        if cases:
+            page, form = pages.get_nowait()
+            try:
+                await open_form(page, form)
+                post_form = await read_post_form(form)
+            except PlaywrightError:
+                pass
+            finally:
+                pages.put_nowait((page, form))
+            if post_form is None:
+                print("Search form is not a plain POST; using the browser for every case")
+
+        async def post_case(case: dict) -> str:
+            # Submit the search as one HTTP request sharing the context's cookies.
+            # Returns None if the response is not a recognizable result page
+            # (e.g. the site needs JavaScript), so the caller falls back to the browser.
+            names = post_form["names"]
+            payload = dict(post_form["fields"])
+            payload[names["county_num"]] = post_form["counties"].get(case["County"], case["County"])
+            payload[names["case_year"]] = case["YearSuffix"]
+            payload[names["case_id"]] = str(case["CaseNumber"])
+            try:
+                response = await context.request.post(post_form["action"], form=payload)
+                if not response.ok:
+                    return None
+                html = await response.text()
+            except PlaywrightError:
+                return None
+            if "Case Summary" in html or is_no_results_page(html):
+                return html
+            return None
+
+        async def browse_case(page, form: dict, case: dict) -> str:
+            # Fallback: drive the search form in the browser
+            submitted = False
+            try:
+                # Open the search page
+                await open_form(page, form)
+
+                # Fill in the per-case form inputs
+                await form["county_num"].select_option(str(case["County"]))
+                # two-digit year suffix, precomputed with the batch
+                await form["case_year"].fill(case["YearSuffix"])
+                await form["case_id"].fill(str(case["CaseNumber"]))
+
+                # Submit search
+                await form["search"].click()
+                submitted = True
+                # Wait for either the case summary or the no-results alert
+                await form["result"].wait_for(state="visible")
+
+                return await page.content()
+            finally:
+                # Step back to the search form for this page's next case;
+                # if that fails, open_form reloads it from scratch. Before the
+                # submit the page is still on the form, so it stays put.
+                if submitted:
+                    with contextlib.suppress(PlaywrightError):
+                        await page.go_back(wait_until="domcontentloaded")
+
+        async def _one(page, form: dict, case: dict) -> None:
+            try:
+                html = await post_case(case) if post_form else None
+                if html is None:
+                    html = await browse_case(page, form, case)
+
+                if "Case Summary" in html:
+                    # Save docket HTML and queue it for MongoDB
+                    stored = {k: v for k, v in case.items() if k not in SCRAPE_ONLY_FIELDS}
+                    await enqueue(build_record(stored, html))
+                else:
+                    print("Not Available for case:", case)
+
+            except PlaywrightError as e:
+                # Timeouts, net::ERR_* failures and crashed pages fail only this case
+                print("ERROR scraping case:", case, f"({type(e).__name__})")
+
+        async def bounded(case: dict) -> None:
+            # Waiting on the pool caps concurrency at the number of pages
+            page, form = await pages.get()
+            try:
+                await _one(page, form, case)
+            finally:
+                pages.put_nowait((page, form))
+
+        writer_task = asyncio.create_task(writer())
+        workers = [asyncio.create_task(bounded(case)) for case in cases]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # One failure aborts the batch; stop the other workers before
+            # the context and browser are closed under them
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            # Let the writer drain the queue and flush its last batch
+            await enqueue(done)
+            await writer_task
+
+
+def run(coro):
+    """
+    Run a scraping coroutine to completion, on uvloop where it is installed
+    and on the default asyncio event loop otherwise.
+    """
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
@@ -1,6 +1,6 @@
 import polars as pl
-from pymongo import MongoClient
 from datetime import date
+from db import get_collection
 
 # Expected number of new case IDs to generate per county-year
 BATCH_SIZE = {
@@ -16,8 +16,11 @@ COUNTY_MAP = {
     "59": "Sarpy"
 }
 
+# Mapping from county name back to county code
+INV_COUNTY_MAP = {v: k for k, v in COUNTY_MAP.items()}
+
 # Aggregation pipeline to find the highest case number per (year, county)
-# Only consider this year 
+# A $match on the latest year is prepended at call time so only that year is grouped
 AGG_PIPELINE = [
     {
         "$group": {
@@ -34,6 +37,8 @@ AGG_PIPELINE = [
 def parse_case_info(case_str: str, county_map: dict = COUNTY_MAP) -> dict:
     """
     Parse a case identifier string into its components.
+    The batch builders no longer call this; test.ipynb still imports it to
+    break down stored CaseIDs.
 
     Example input: "D 01 JV 25 0000123"
     Returns: {
@@ -64,87 +69,92 @@ def get_next_n_cases(MONGO_URI) -> pl.DataFrame:
     Generate the next batch of case IDs to scrape based on stored data.
     Works for the latest year in the database dynamically.
     """
-    client = MongoClient(MONGO_URI)
-    db = client["Cluster0"]
-    collection = db["Cases"]
-    checkpoints = list(collection.aggregate(AGG_PIPELINE))
+    collection = get_collection(MONGO_URI)
+
+    # Lookup of the latest year and of its (year, county) groups; both use the
+    # case index from db.ensure_indexes
+    latest = collection.find_one({}, {"CaseYear": 1}, sort=[("CaseYear", -1)])
 
-    if not checkpoints:
+    if latest is None:
         print("No existing cases found in DB.")
         return pl.DataFrame([])
 
-    latest_year = max(ckpt["_id"]["CaseYear"] for ckpt in checkpoints)
+    latest_year = latest["CaseYear"]
+    pipeline = [{"$match": {"CaseYear": latest_year}}, *AGG_PIPELINE]
+    checkpoints = list(collection.aggregate(pipeline))
 
-    inv_county_map = {v: k for k, v in COUNTY_MAP.items()}
+    # two-digit year suffix, shared by every generated case
+    year_suffix = str(latest_year - 2000)
 
-    raw_ids = []
+    # Build the columns directly while generating IDs, so nothing has to be re-parsed
+    columns = {"CaseID": [], "CaseYear": [], "YearSuffix": [], "County": [], "CaseNumber": []}
     for ckpt in checkpoints:
-        if ckpt["_id"]["CaseYear"] != latest_year:
-            continue
-
         county = ckpt["_id"]["County"]
-        county_code = inv_county_map.get(county, "00") 
-        year_suffix = str(latest_year - 2000)
+        county_code = INV_COUNTY_MAP.get(county, "00") 
+        county_name = COUNTY_MAP.get(county_code, "Unknown")
 
         start_num = int(ckpt["MaxCaseNumber"]) + 1
         batch_size = BATCH_SIZE.get(county, 10) 
 
         for offset in range(batch_size):
             num_str = str(start_num + offset).zfill(7)
-            raw_ids.append(f"D {county_code} JV {year_suffix} {num_str}")
-
-    df = pl.DataFrame({"CaseID": raw_ids})
-
-
-    df = df.with_columns(
-        pl.col("CaseID").map_elements(
-            parse_case_info,
-            return_dtype=pl.Struct([
-                pl.Field("CaseYear", pl.Int64),
-                pl.Field("County", pl.Utf8),
-                pl.Field("CaseNumber", pl.Utf8)
-            ])
-        ).alias("parsed"),
+            columns["CaseID"].append(f"D {county_code} JV {year_suffix} {num_str}")
+            columns["CaseYear"].append(latest_year)
+            columns["YearSuffix"].append(year_suffix)
+            columns["County"].append(county_name)
+            columns["CaseNumber"].append(num_str)
+
+    df = pl.DataFrame(
+        columns,
+        schema={
+            "CaseID": pl.Utf8,
+            "CaseYear": pl.Int64,
+            "YearSuffix": pl.Utf8,
+            "County": pl.Utf8,
+            "CaseNumber": pl.Utf8
+        }
+    ).with_columns(
         pl.lit(date.today()).cast(pl.Datetime).alias("TimeScraped"),
         pl.lit(None).alias("Docket"),
         pl.lit(None).alias("DateOfBirth")
-    ).unnest("parsed")
+    )
 
     return df
-# util.py
-from pymongo import MongoClient
-import polars as pl
-from datetime import datetime
 
-import polars as pl
-from pymongo import MongoClient
+
+# A case has bounced when it was stored without a docket
+BOUNCED_FILTER = {"Docket": {"$in": [None, ""]}}
+
+# Fields needed to re-scrape a bounced case
+BOUNCED_FIELDS = ["CaseID", "CaseYear", "County", "CaseNumber"]
+BOUNCED_PROJECTION = {"_id": 0, **{field: 1 for field in BOUNCED_FIELDS}}
 
 def get_bounced_cases(mongo_uri: str) -> pl.DataFrame:
     """
     Fetch bounced cases from MongoDB and return as a Polars DataFrame.
     """
-    # Connect to MongoDB
-    client = MongoClient(mongo_uri)
-
-    # Use the correct database and collection
-    db = client["Cluster0"]  # <-- correct database
-    collection = db["Cases"]
-
-    # Fetch all documents
-    docs = list(collection.find({}))
-    print(f"Total documents fetched from MongoDB: {len(docs)}")
-
-    if not docs:
-        print("No documents found in collection.")
+    # Shared connection to the cases collection
+    collection = get_collection(mongo_uri)
+
+    # Fetch only bounced documents (Docket missing, null or empty), and only
+    # the fields needed to re-scrape them so the Docket HTML never crosses the wire
+    # Stream the cursor straight into columns instead of materializing every document
+    columns = {field: [] for field in BOUNCED_FIELDS}
+    for doc in collection.find(BOUNCED_FILTER, BOUNCED_PROJECTION):
+        for field, values in columns.items():
+            values.append(doc.get(field))
+
+    n_docs = len(columns["CaseID"])
+    print(f"Bounced documents fetched from MongoDB: {n_docs}")
+
+    if not n_docs:
+        print("No bounced cases found in collection.")
         return pl.DataFrame([])  # return empty DataFrame
 
-    # Convert to Polars DataFrame
-    df = pl.DataFrame(docs)
-
-    # Optional: filter for "bounced" cases if you have a specific condition
-    # For example, if bounced cases are those where 'Docket' is empty or null:
-    if "Docket" in df.columns:
-        df = df.filter(df["Docket"].is_null() | (df["Docket"] == ""))
+    # Convert to Polars DataFrame, precomputing the two-digit year suffix the scraper types in
+    df = pl.DataFrame(columns).with_columns(
+        (pl.col("CaseYear") - 2000).cast(pl.Utf8).alias("YearSuffix")
+    )
 
     print(f"Shape of DataFrame after filtering bounced cases: {df.shape}")
     print("Columns:", df.columns)